@@ -5,6 +5,53 @@ import pandas as pd
 import matplotlib.pyplot as plt
 
 from lib.BaseStrategy import BaseStrategy
+from lib._numba import njit
+
+try:
+    import polars as pl
+    HAVE_POLARS = True
+except ImportError:
+    HAVE_POLARS = False
+
+_ANN_FACTOR = np.sqrt(252.0)  # daily -> annualized Sharpe
+
+
+@njit(cache=True)
+def _bar_kernel(close, signal, notional, cost_per_unit):
+    """
+    One fused pass over the trade bars computing ret, position (last signal
+    forward-filled then lagged one bar), turnover, gross pnl, costs and net
+    pnl. Replaces the pct_change/ffill/shift/abs chain, which materialized a
+    full-length temporary per step. signal is int8 with 0 meaning 'no signal
+    yet', which lags identically to the old NaN encoding since the flat
+    position is 0 anyway; position/turnover stay int8 end to end.
+    """
+    n = close.shape[0]
+    ret = np.empty(n)
+    position = np.empty(n, dtype=np.int8)
+    turnover = np.empty(n, dtype=np.int8)
+    pnl_gross = np.empty(n)
+    costs = np.empty(n)
+    pnl = np.empty(n)
+    last_sig = np.int8(0)
+    prev_pos = np.int8(0)
+    prev_close = np.nan
+    for i in range(n):
+        r = close[i] / prev_close - 1.0
+        if np.isnan(r):
+            r = 0.0
+        pos = last_sig
+        to = abs(pos - prev_pos) if i > 0 else abs(pos)
+        ret[i] = r
+        position[i] = pos
+        turnover[i] = to
+        pnl_gross[i] = notional * pos * r
+        costs[i] = cost_per_unit * to
+        pnl[i] = pnl_gross[i] - costs[i]
+        last_sig = signal[i]
+        prev_pos = pos
+        prev_close = close[i]
+    return ret, position, turnover, pnl_gross, costs, pnl
 
 
 class Backtester:
@@ -21,6 +68,8 @@ class Backtester:
         self.notional = float(notional)
         self.transaction_cost_bps = float(transaction_cost_bps)
         self.resample_freq = resample_freq
+        # zero when fees are disabled; the kernel multiplies unconditionally
+        self._cost_per_unit = (self.transaction_cost_bps / 1e4) * self.notional
 
     # ---------------- public API ----------------
 
@@ -28,7 +77,7 @@ class Backtester:
         bar_df = self._build_trade_frame_from_native_signals(self.df)
         daily_df = self._daily_group(bar_df)
         if len(daily_df) > 1 and daily_df["daily_return"].std(ddof=1) > 0:
-            sharpe = daily_df["daily_return"].mean() / daily_df["daily_return"].std(ddof=1) * np.sqrt(252.0)
+            sharpe = daily_df["daily_return"].mean() / daily_df["daily_return"].std(ddof=1) * _ANN_FACTOR
         else:
             sharpe = float("nan")
         total_return = float((1.0 + daily_df["daily_return"]).prod() - 1.0)
@@ -43,54 +92,79 @@ class Backtester:
         3) Align 'last native signal up to trade bar END' -> then shift one bar to avoid look-ahead
         4) Compute returns/PnL/turnover on trading cadence
         """
-        # --- 1) signals on native ---
-        signals = self.strategy.generate_signals(df_native)
-        if not {"signal", "signal_ready_time"}.issubset(signals.columns):
-            raise ValueError("Strategy must return ['signal','signal_ready_time']")
-        signals.sort_values("signal_ready_time", inplace=True)
+        # --- 1) signals on native (memoized across parameter-sweep runs) ---
+        # arrays straight from the strategy: no signal DataFrame is built or
+        # consolidated on this path
+        sig_vals8, sig_t64 = self.strategy.cached_generate_signal_arrays(df_native)
+        if sig_vals8.shape != sig_t64.shape:
+            raise ValueError("Strategy must return equal-length (signal, signal_ready_time) arrays")
+        sig_t = sig_t64.view("int64")
+        # loader output and resampled bars are normally already sorted
+        if sig_t.size and not (sig_t[1:] >= sig_t[:-1]).all():
+            order = np.argsort(sig_t, kind="stable")
+            sig_vals8 = sig_vals8[order]
+            sig_t64 = sig_t64[order]
+            sig_t = sig_t64.view("int64")
 
         # --- 2) trading bars ---
         trade_bars = self._build_trade_bars(df_native)
-        trade_bars.sort_values("open_dt", inplace=True)
-        trade_bars["ret"] = trade_bars["close"].pct_change().fillna(0.0)
+        if not trade_bars["open_dt"].is_monotonic_increasing:
+            trade_bars = trade_bars.sort_values("open_dt")
 
         # --- 3) align native signals to trade bar end ---
-        # aligned = trade_bars.merge(signals, left_on="open_dt",
-        #                            right_on="signal_ready_time",
-        #                            how="left")
-        trade_bars.sort_values("close_dt", inplace=True)
-        merged_df = pd.merge_asof(
-            trade_bars,
-            signals,
-            left_on="close_dt",
-            right_on="signal_ready_time",
-            direction="backward",
-            allow_exact_matches=True,
+        # both time columns are sorted int64 under the hood, so the backward
+        # merge_asof with exact matches is just searchsorted(side="right") - 1
+        merged_df = trade_bars
+        if not merged_df["close_dt"].is_monotonic_increasing:
+            merged_df = merged_df.sort_values("close_dt")
+        merged_df = merged_df.reset_index(drop=True)
+        bar_t = merged_df["close_dt"].values.view("int64")
+        i_nat = np.iinfo(np.int64).min
+        if sig_t.size:
+            idx = np.searchsorted(sig_t, bar_t, side="right") - 1
+            safe_idx = np.clip(idx, 0, None)
+            # bars before the first signal carry 0 (flat), so the whole
+            # signal column stays int8 instead of a NaN-bearing float64
+            signal = np.where(idx >= 0, sig_vals8[safe_idx], np.int8(0))
+            ready = np.where(idx >= 0, sig_t[safe_idx], i_nat)
+        else:
+            signal = np.zeros(bar_t.size, dtype=np.int8)
+            ready = np.full(bar_t.size, i_nat)
+        merged_df["signal"] = signal
+        # view back at the source resolution (the loader emits ms datetimes)
+        time_dtype = sig_t64.dtype if sig_t.size else merged_df["close_dt"].values.dtype
+        merged_df["signal_ready_time"] = pd.DatetimeIndex(ready.view(time_dtype), tz="UTC")
+
+        # --- 4) returns, turnover, costs, pnl (single fused pass) ---
+        ret, position, turnover, pnl_gross, costs, pnl = _bar_kernel(
+            np.ascontiguousarray(merged_df["close"].to_numpy(dtype=np.float64)),
+            np.ascontiguousarray(signal),
+            self.notional, self._cost_per_unit,
         )
-        position = merged_df["signal"].ffill().shift(1).fillna(0.0)
-
-        # --- 4) turnover, costs, pnl ---
-        turnover = (position - position.shift(1)).abs().fillna(position.abs())
-        pnl_gross = self.notional * position * trade_bars["ret"]
-        cost_per_unit = (self.transaction_cost_bps / 1e4) * self.notional
-        costs = cost_per_unit * turnover if self.transaction_cost_bps > 0 else 0.0
-        merged_df['pnl'] = pnl_gross - costs
-        merged_df["position"] = position.values
-        merged_df["turnover"] = turnover.values
-        merged_df["pnl_gross"] = pnl_gross.values
-        merged_df["costs"] = costs if np.isscalar(costs) else costs.values
+        merged_df["ret"] = ret
+        merged_df["pnl"] = pnl
+        merged_df["position"] = position
+        merged_df["turnover"] = turnover
+        merged_df["pnl_gross"] = pnl_gross
+        merged_df["costs"] = costs
         return merged_df
 
     def _daily_group(self, bar_df: pd.DataFrame) -> pd.DataFrame:
-        dt = pd.to_datetime(bar_df["open_dt"], utc=True)
-        tmp = bar_df.copy()
-        tmp["day"] = dt.dt.date
-
-        daily = tmp.groupby("day", as_index=False).agg(
-            daily_pnl=("pnl", "sum"),
-            daily_turnover=("turnover", "sum"),
-            bars=("ret", "count"),
-        )
+        # bar_df is time-sorted, so days form contiguous runs: find the run
+        # boundaries on the int64 day buckets and segment-sum with reduceat
+        # instead of copying the frame and grouping on Python date objects.
+        if not len(bar_df):
+            daily = pd.DataFrame({"day": [], "daily_pnl": [], "daily_turnover": [], "bars": []})
+        else:
+            days = bar_df["open_dt"].values.astype("datetime64[D]")
+            day_i8 = days.view("int64")
+            starts = np.concatenate(([0], np.flatnonzero(np.diff(day_i8)) + 1))
+            daily = pd.DataFrame({
+                "day": days[starts].astype(object),
+                "daily_pnl": np.add.reduceat(bar_df["pnl"].to_numpy(dtype=np.float64), starts),
+                "daily_turnover": np.add.reduceat(bar_df["turnover"].to_numpy(dtype=np.float64), starts),
+                "bars": np.diff(np.append(starts, day_i8.size)),
+            })
         daily["daily_return"] = daily["daily_pnl"] / self.notional
         daily["profit_over_turnover"] = 10000 * np.where(
             daily["daily_turnover"] > 0, daily["daily_pnl"] / daily["daily_turnover"], np.nan
@@ -104,8 +178,16 @@ class Backtester:
         If resample_freq is None -> use native cadence as 'trade bars'.
         """
         if not self.resample_freq:
-            cols = ["open_dt", "open", "high", "low", "close", "volume"]
-            return df_native[cols].copy()
+            # assemble from the existing column arrays instead of slicing and
+            # copying; close_dt is required by the signal alignment step
+            cols = ["open_dt", "close_dt", "open", "high", "low", "close", "volume"]
+            return pd.DataFrame({c: df_native[c].array for c in cols if c in df_native.columns},
+                                copy=False)
+
+        if HAVE_POLARS:
+            trade = self._build_trade_bars_polars(df_native)
+            if trade is not None:
+                return trade
 
         x = df_native.set_index("open_dt")
         agg = {"open": "first", "high": "max",
@@ -121,3 +203,42 @@ class Backtester:
             .reset_index()
         )
         return trade
+
+    def _build_trade_bars_polars(self, df_native: pd.DataFrame) -> pd.DataFrame | None:
+        """
+        Multithreaded resample via polars group_by_dynamic; the OHLC
+        aggregation runs in one fused query plan. Returns None for
+        calendar-dependent frequencies and for windows that do not divide a
+        day, which stay on pandas resample.
+        """
+        try:
+            every_ns = pd.tseries.frequencies.to_offset(self.resample_freq).nanos
+        except ValueError:
+            return None
+        # group_by_dynamic aligns windows to the epoch while pandas resample
+        # aligns to midnight of the first day (origin='start_day'); the two
+        # only produce the same bars when the window divides 24h exactly
+        if 86_400_000_000_000 % every_ns != 0:
+            return None
+        cols = ["open_dt", "open", "high", "low", "close", "close_dt"]
+        if "volume" in df_native.columns:
+            cols.append("volume")
+        aggs = [pl.col("open").first(), pl.col("high").max(),
+                pl.col("low").min(), pl.col("close").last(),
+                pl.col("close_dt").last()]
+        if "volume" in df_native.columns:
+            aggs.append(pl.col("volume").sum())
+
+        trade = (
+            pl.from_pandas(df_native[cols]).lazy()
+            .sort("open_dt")
+            .group_by_dynamic("open_dt", every=f"{every_ns}ns", closed="left", label="left")
+            .agg(aggs)
+            .collect()
+            .to_pandas()
+        )
+        # polars works at us resolution; restore the native datetime dtype so
+        # the int64 views in the signal alignment stay unit-consistent
+        for c in ("open_dt", "close_dt"):
+            trade[c] = trade[c].astype(df_native[c].dtype)
+        return trade.dropna(subset=["open", "high", "low", "close"]).reset_index(drop=True)
@@ -1,40 +1,171 @@
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    import bottleneck as bn
+    HAVE_BOTTLENECK = True
+except ImportError:
+    HAVE_BOTTLENECK = False
+
+
+# both memo dicts evict their oldest entry past this size, so long multi-
+# symbol sessions don't accumulate signal/ratio arrays without bound
+_CACHE_MAX_ENTRIES = 64
 
 
 class BaseStrategy:
+    # process-wide memo of signal arrays, shared by all strategy instances:
+    # parameter sweeps over the same df skip the full recomputation
+    _signal_cache: dict = {}
+    # memo of intermediate arrays (ratios, price vectors, prefix sums) that
+    # are parameter-independent, so instances sweeping different parameters
+    # over the same df share them
+    _array_cache: dict = {}
+
     def __init__(self, price_col, allow_short):
         self.price_col = price_col
         self.allow_short = bool(allow_short)
 
-    def generate_signals(self, df: pd.DataFrame) -> pd.DataFrame:
+    def generate_signal_arrays(self, df: pd.DataFrame) -> tuple:
         """
-        Must return columns:
-          - 'signal' : {-1,0,1}
-          - 'signal_ready_time' : tz-aware timestamp Series
+        Must return a pair of equal-length arrays:
+          - signal : int8 ndarray in {-1,0,1}
+          - signal_ready_time : datetime64 ndarray (UTC), no NaT entries
         """
         raise NotImplementedError
 
+    def generate_signals(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        DataFrame view of generate_signal_arrays with columns 'signal' and
+        'signal_ready_time'; the backtester consumes the arrays directly.
+        """
+        signal, ready = self.generate_signal_arrays(df)
+        return pd.DataFrame({
+            "signal": pd.Series(signal, dtype=np.int8),
+            "signal_ready_time": pd.DatetimeIndex(ready, tz="UTC"),
+        }, copy=False)
+
+    @staticmethod
+    def _df_fingerprint(df: pd.DataFrame) -> tuple:
+        # content-based identity: survives df garbage collection / id reuse
+        # and invalidates when the frame is swapped for a different range.
+        # Time endpoints alone collide across symbols loaded for the same
+        # range at the same freq, so endpoint close/volume values are folded
+        # in to tell the actual series apart.
+        if len(df) and "open_time" in df.columns:
+            fp = [len(df), int(df["open_time"].iloc[0]), int(df["open_time"].iloc[-1])]
+            for c in ("close", "volume"):
+                if c in df.columns:
+                    fp.append(float(df[c].iloc[0]))
+                    fp.append(float(df[c].iloc[-1]))
+            return tuple(fp)
+        return (len(df), id(df))
+
+    def _cache_key(self, df: pd.DataFrame) -> tuple:
+        params = tuple(sorted(self.__dict__.items()))
+        return (type(self).__name__, self._df_fingerprint(df), params)
+
+    @classmethod
+    def _cached_array(cls, df: pd.DataFrame, name, build):
+        """Memoize a parameter-independent intermediate (callers must not
+        mutate the result); build() runs on a miss."""
+        key = (name, cls._df_fingerprint(df))
+        hit = cls._array_cache.get(key)
+        if hit is None:
+            if len(cls._array_cache) >= _CACHE_MAX_ENTRIES:
+                cls._array_cache.pop(next(iter(cls._array_cache)))
+            hit = cls._array_cache[key] = build()
+        return hit
+
+    def cached_generate_signal_arrays(self, df: pd.DataFrame) -> tuple:
+        """
+        Memoized generate_signal_arrays keyed on the input frame identity and
+        the strategy parameters. Callers must treat the result as read-only.
+        """
+        key = self._cache_key(df)
+        out = self._signal_cache.get(key)
+        if out is None:
+            if len(self._signal_cache) >= _CACHE_MAX_ENTRIES:
+                self._signal_cache.pop(next(iter(self._signal_cache)))
+            out = self._signal_cache[key] = self.generate_signal_arrays(df)
+        return out
+
+    def cached_generate_signals(self, df: pd.DataFrame) -> pd.DataFrame:
+        """DataFrame view over the memoized arrays; treat as read-only."""
+        signal, ready = self.cached_generate_signal_arrays(df)
+        return pd.DataFrame({
+            "signal": pd.Series(signal, dtype=np.int8),
+            "signal_ready_time": pd.DatetimeIndex(ready, tz="UTC"),
+        }, copy=False)
+
     @staticmethod
     def name() -> str:
         raise NotImplementedError
 
-    def align_signal_ready_time(self, df: pd.DataFrame, raw_signals) -> pd.DataFrame:
-        if not self.allow_short:
-            raw_signals = np.where(raw_signals > 0, 1, 0)
+    @staticmethod
+    def _to_np(df: pd.DataFrame, col: str) -> np.ndarray:
+        """
+        float64 array of a column without pd.to_numeric's inference pass:
+        loader frames are already numeric, so this is a view (float64) or a
+        straight cast. Object columns still take the coercion path.
+        """
+        arr = df[col].to_numpy()
+        if arr.dtype == np.float64:
+            return arr
+        if np.issubdtype(arr.dtype, np.number):
+            return arr.astype(np.float64)
+        return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float64)
+
+    @staticmethod
+    def _rolling_mean(x, n: int) -> np.ndarray:
+        """
+        C-speed drop-in for Series.rolling(n, min_periods=n).mean(): uses
+        bottleneck.move_mean when available (min_count=n gives the same NaN
+        behavior), otherwise falls back to pandas. Returns a float64 ndarray.
+        """
+        arr = x.to_numpy(dtype=np.float64) if hasattr(x, "to_numpy") else np.asarray(x, dtype=np.float64)
+        if HAVE_BOTTLENECK:
+            return bn.move_mean(arr, window=n, min_count=n)
+        # stride-tricks view + mean reduction: no per-window dispatch and no
+        # pandas block wrapping. np.mean (not nanmean) so a NaN anywhere in
+        # the window yields NaN, matching min_periods=n.
+        out = np.full(arr.size, np.nan)
+        if arr.size >= n:
+            out[n - 1:] = sliding_window_view(arr, n).mean(axis=1)
+        return out
 
-        signal = pd.Series(raw_signals, index=df.index, dtype=float, name="signal")
+    def align_signal_arrays(self, df: pd.DataFrame, raw_signals,
+                            long_only_encoded: bool = False) -> tuple:
+        # signals live in {-1,0,1}: int8 keeps them 8x smaller than the old
+        # float column through the cache and the backtester merge
+        raw_signals = np.asarray(raw_signals).astype(np.int8, copy=False)
+        if not self.allow_short and not long_only_encoded:
+            raw_signals = np.where(raw_signals > 0, np.int8(1), np.int8(0))
 
         # --- timing: prefer shifted open_dt for close-based signals ---
         if "open_dt" in df.columns:
             ready = df["close_dt"] if self.price_col == "close" else df["open_dt"]
         else:
-            ready = signal.index
+            ready = df.index
 
-        out = pd.DataFrame({
-            "signal": signal,
-            "signal_ready_time": pd.to_datetime(ready, utc=True)
-        }).dropna(subset=["signal_ready_time"])
+        # the loader already emits tz-aware columns; re-running to_datetime on
+        # them is a full-column validation scan for nothing
+        if not isinstance(ready.dtype, pd.DatetimeTZDtype):
+            ready = pd.to_datetime(ready, utc=True)
+        ready = ready.values
 
-        return out
+        nat = np.isnat(ready)
+        if nat.any():
+            keep = ~nat
+            return raw_signals[keep], ready[keep]
+        return raw_signals, ready
+
+    def align_signal_ready_time(self, df: pd.DataFrame, raw_signals,
+                                long_only_encoded: bool = False) -> pd.DataFrame:
+        signal, ready = self.align_signal_arrays(df, raw_signals, long_only_encoded)
+        return pd.DataFrame({
+            "signal": pd.Series(signal, dtype=np.int8),
+            "signal_ready_time": pd.DatetimeIndex(ready, tz="UTC"),
+        }, copy=False)
 
@@ -2,6 +2,172 @@ import numpy as np
 import pandas as pd
 
 from lib.BaseStrategy import BaseStrategy
+from lib._numba import njit, prange, get_num_threads, HAVE_NUMBA
+
+
+@njit(cache=True)
+def _follow_volume_kernel(buy_ratio, quote_buy_ratio, window, lower_threshold, higher_threshold):
+    """
+    Single streaming pass over both ratio arrays: maintains running window
+    sums (add-new/drop-old) plus NaN counters, and encodes the bull/bear
+    conditions directly into an int8 signal. Matches
+    rolling(window, min_periods=window).mean() semantics: any NaN inside the
+    window makes the mean undefined, which yields a 0 signal.
+    """
+    n = buy_ratio.shape[0]
+    raw = np.zeros(n, dtype=np.int8)
+    sum_buy = 0.0
+    sum_quote = 0.0
+    nan_buy = 0
+    nan_quote = 0
+    for i in range(n):
+        b = buy_ratio[i]
+        q = quote_buy_ratio[i]
+        if np.isnan(b):
+            nan_buy += 1
+        else:
+            sum_buy += b
+        if np.isnan(q):
+            nan_quote += 1
+        else:
+            sum_quote += q
+        if i >= window:
+            b_old = buy_ratio[i - window]
+            q_old = quote_buy_ratio[i - window]
+            if np.isnan(b_old):
+                nan_buy -= 1
+            else:
+                sum_buy -= b_old
+            if np.isnan(q_old):
+                nan_quote -= 1
+            else:
+                sum_quote -= q_old
+        if i >= window - 1 and nan_buy == 0 and nan_quote == 0:
+            ma_buy = sum_buy / window
+            ma_quote = sum_quote / window
+            # each band edge feeds both the bull and bear tests: multiply once
+            lo_b = lower_threshold * ma_buy
+            hi_b = higher_threshold * ma_buy
+            lo_q = lower_threshold * ma_quote
+            hi_q = higher_threshold * ma_quote
+            bull = (b >= lo_b) and (b <= hi_b) and (q >= lo_q) and (q <= hi_q)
+            bear = ((b <= lo_b) or (b >= hi_b)) and ((q <= lo_q) or (q >= hi_q))
+            if bull:
+                raw[i] = 1
+            elif bear:
+                raw[i] = -1
+    return raw
+
+
+@njit(parallel=True, cache=True)
+def _follow_volume_kernel_par(buy_ratio, quote_buy_ratio, window, lower_threshold, higher_threshold, n_chunks):
+    """
+    Chunked-parallel variant of _follow_volume_kernel: prange splits the
+    series into contiguous blocks, and each block rebuilds its window state by
+    streaming over the window-1 bars before its start. That re-scan costs
+    O(n_chunks * window) redundant work, which is why callers only pick this
+    path when the chunks dwarf the window.
+    """
+    n = buy_ratio.shape[0]
+    raw = np.zeros(n, dtype=np.int8)
+    chunk = (n + n_chunks - 1) // n_chunks
+    for c in prange(n_chunks):
+        lo = c * chunk
+        hi = min(lo + chunk, n)
+        start = max(0, lo - window + 1)
+        sum_buy = 0.0
+        sum_quote = 0.0
+        nan_buy = 0
+        nan_quote = 0
+        for i in range(start, hi):
+            b = buy_ratio[i]
+            q = quote_buy_ratio[i]
+            if np.isnan(b):
+                nan_buy += 1
+            else:
+                sum_buy += b
+            if np.isnan(q):
+                nan_quote += 1
+            else:
+                sum_quote += q
+            if i - window >= start:
+                b_old = buy_ratio[i - window]
+                q_old = quote_buy_ratio[i - window]
+                if np.isnan(b_old):
+                    nan_buy -= 1
+                else:
+                    sum_buy -= b_old
+                if np.isnan(q_old):
+                    nan_quote -= 1
+                else:
+                    sum_quote -= q_old
+            if i >= lo and i >= window - 1 and nan_buy == 0 and nan_quote == 0:
+                ma_buy = sum_buy / window
+                ma_quote = sum_quote / window
+                lo_b = lower_threshold * ma_buy
+                hi_b = higher_threshold * ma_buy
+                lo_q = lower_threshold * ma_quote
+                hi_q = higher_threshold * ma_quote
+                bull = (b >= lo_b) and (b <= hi_b) and (q >= lo_q) and (q <= hi_q)
+                bear = ((b <= lo_b) or (b >= hi_b)) and ((q <= lo_q) or (q >= hi_q))
+                if bull:
+                    raw[i] = 1
+                elif bear:
+                    raw[i] = -1
+    return raw
+
+
+def _nan_cumsums(x: np.ndarray):
+    """Prefix sums of the values (NaN as 0) and of the NaN counts, both with a
+    leading zero; together they reproduce min_periods=window rolling means."""
+    cs = np.empty(x.size + 1, dtype=np.float64)
+    cs[0] = 0.0
+    np.cumsum(np.nan_to_num(x, nan=0.0), out=cs[1:])
+    cn = np.empty(x.size + 1, dtype=np.int64)
+    cn[0] = 0
+    np.cumsum(np.isnan(x), out=cn[1:])
+    return cs, cn
+
+
+def _ma_from_cumsums(cs: np.ndarray, cn: np.ndarray, n: int) -> np.ndarray:
+    out = np.full(cs.size - 1, np.nan)
+    sums = cs[n:] - cs[:-n]
+    dirty = (cn[n:] - cn[:-n]) > 0
+    tail = sums / n
+    tail[dirty] = np.nan
+    out[n - 1:] = tail
+    return out
+
+
+def _encode_raw(buy_ratio, quote_buy_ratio, ma_buy, ma_quote, lower_threshold, higher_threshold):
+    """Vectorized twin of the kernel's bull/bear encoding (bull wins ties);
+    the boolean algebra runs in place on two masks instead of allocating a
+    fresh array per & / | term."""
+    # each band edge is compared against in both the bull and bear masks:
+    # materialize the four threshold * MA products once
+    lo_b = lower_threshold * ma_buy
+    hi_b = higher_threshold * ma_buy
+    lo_q = lower_threshold * ma_quote
+    hi_q = higher_threshold * ma_quote
+
+    bull = buy_ratio >= lo_b
+    np.logical_and(bull, buy_ratio <= hi_b, out=bull)
+    np.logical_and(bull, quote_buy_ratio >= lo_q, out=bull)
+    np.logical_and(bull, quote_buy_ratio <= hi_q, out=bull)
+
+    bear = buy_ratio <= lo_b
+    np.logical_or(bear, buy_ratio >= hi_b, out=bear)
+    quote_out = quote_buy_ratio <= lo_q
+    np.logical_or(quote_out, quote_buy_ratio >= hi_q, out=quote_out)
+    np.logical_and(bear, quote_out, out=bear)
+
+    # both masks can hold together exactly on a band edge; bull wins the tie,
+    # matching the kernels' if/elif. Reinterpreting the byte-sized bool masks
+    # as int8 makes the ternary a single subtraction with no int64 temporary.
+    np.logical_and(bear, np.logical_not(bull), out=bear)
+    raw = bull.view(np.int8)
+    np.subtract(raw, bear.view(np.int8), out=raw)
+    return raw
 
 
 class FollowVolumeStrategy(BaseStrategy):
@@ -21,27 +187,67 @@ class FollowVolumeStrategy(BaseStrategy):
     def name():
         return "FollowVolume"
 
-    def generate_signals(self, df: pd.DataFrame) -> pd.DataFrame:
-        # ---- ratios (robust to zero volumes) ----
-        volume = pd.to_numeric(df.get("volume"), errors="coerce").replace(0, np.nan)
-        qvol = pd.to_numeric(df.get("quote_volume"), errors="coerce").replace(0, np.nan)
-        tbv = pd.to_numeric(df.get("taker_buy_volume"), errors="coerce")
-        tbqv = pd.to_numeric(df.get("taker_buy_quote_volume"), errors="coerce")
+    def generate_signal_arrays(self, df: pd.DataFrame) -> tuple:
+        buy_ratio, quote_buy_ratio = self._cached_array(df, "fv_ratios", lambda: self._ratios(df))
 
-        buy_ratio = (tbv / volume).clip(0, 1)  # fraction of base volume that was taker-buy
-        quote_buy_ratio = (tbqv / qvol).clip(0, 1)  # fraction of notional that was taker-buy
+        if HAVE_NUMBA:
+            # ---- rolling means + conditions, fused in one pass ----
+            # go parallel only when each thread's chunk is much longer than the
+            # window, so the per-chunk warmup re-scan stays negligible
+            n_threads = get_num_threads()
+            if n_threads > 1 and buy_ratio.size >= n_threads * self.window * 16:
+                raw = _follow_volume_kernel_par(
+                    buy_ratio, quote_buy_ratio,
+                    self.window, self.lower_threshold, self.higher_threshold,
+                    n_threads,
+                )
+            else:
+                raw = _follow_volume_kernel(
+                    buy_ratio, quote_buy_ratio,
+                    self.window, self.lower_threshold, self.higher_threshold,
+                )
+        else:
+            # vectorized path: C rolling means (bottleneck when installed)
+            # plus the same boolean encoding, instead of the interpreted kernel
+            ma_buy = self._rolling_mean(buy_ratio, self.window)
+            ma_quote = self._rolling_mean(quote_buy_ratio, self.window)
+            raw = _encode_raw(buy_ratio, quote_buy_ratio, ma_buy, ma_quote,
+                              self.lower_threshold, self.higher_threshold)
+        return self.align_signal_arrays(df, raw)
 
-        # ---- rolling means ----
-        ma_buy = buy_ratio.rolling(self.window, min_periods=self.window).mean()
-        ma_quote = quote_buy_ratio.rolling(self.window, min_periods=self.window).mean()
+    def generate_signals_batch(self, df: pd.DataFrame, windows) -> dict:
+        """
+        Sweep several lookback windows in one pass: the ratio arrays and their
+        NaN-aware prefix sums are computed once, and each window's moving
+        averages are two slice subtractions. Returns {window: signal frame}.
+        """
+        buy_ratio, quote_buy_ratio = self._cached_array(df, "fv_ratios", lambda: self._ratios(df))
+        cs_buy, cn_buy = self._cached_array(df, "fv_buy_cumsums", lambda: _nan_cumsums(buy_ratio))
+        cs_quote, cn_quote = self._cached_array(df, "fv_quote_cumsums", lambda: _nan_cumsums(quote_buy_ratio))
 
-        # ---- conditions ----
-        bull = (buy_ratio >= self.lower_threshold * ma_buy) & (buy_ratio <= self.higher_threshold * ma_buy)
-        bear = (buy_ratio <= self.lower_threshold * ma_buy) | (buy_ratio >= self.higher_threshold * ma_buy)
+        results = {}
+        for window in windows:
+            window = int(window)
+            ma_buy = _ma_from_cumsums(cs_buy, cn_buy, window)
+            ma_quote = _ma_from_cumsums(cs_quote, cn_quote, window)
+            raw = _encode_raw(buy_ratio, quote_buy_ratio, ma_buy, ma_quote,
+                              self.lower_threshold, self.higher_threshold)
+            results[window] = self.align_signal_ready_time(df, raw)
+        return results
 
-        bull &= (quote_buy_ratio >= self.lower_threshold * ma_quote) & (buy_ratio <= self.higher_threshold * ma_quote)
-        bear &= (quote_buy_ratio <= self.lower_threshold * ma_quote) | (buy_ratio >= self.higher_threshold * ma_quote)
+    @classmethod
+    def _ratios(cls, df: pd.DataFrame):
+        """taker-buy fractions of base volume and of notional, NaN where the
+        denominator volume is zero; clipped to [0, 1] in place."""
+        volume = cls._to_np(df, "volume")
+        qvol = cls._to_np(df, "quote_volume")
+        tbv = cls._to_np(df, "taker_buy_volume")
+        tbqv = cls._to_np(df, "taker_buy_quote_volume")
 
-        raw = np.where(bull, 1, np.where(bear, -1, 0))
-        out = self.align_signal_ready_time(df, raw)
-        return out
+        buy_ratio = np.full(volume.shape, np.nan)
+        np.divide(tbv, volume, out=buy_ratio, where=volume > 0)
+        np.clip(buy_ratio, 0.0, 1.0, out=buy_ratio)
+        quote_buy_ratio = np.full(qvol.shape, np.nan)
+        np.divide(tbqv, qvol, out=quote_buy_ratio, where=qvol > 0)
+        np.clip(quote_buy_ratio, 0.0, 1.0, out=quote_buy_ratio)
+        return buy_ratio, quote_buy_ratio
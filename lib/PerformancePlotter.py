@@ -2,21 +2,91 @@ import os
 
 import pandas as pd
 from matplotlib import pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 
 
 class PerformancePlotter:
+    # reusable headless figure for the show=False path: parameter sweeps call
+    # plot_equity once per run, and rebuilding the Figure/axes/grid through
+    # pyplot each time costs far more than swapping the line data
+    _fig = None
+    _ax = None
+    _line = None
+
     @staticmethod
     def save_daily_csv(daily_df: pd.DataFrame, out_path: str) -> str:
+        """
+        Append-only daily sink: when the file already has rows, only days
+        after its last recorded day are written, so the daily rerun appends
+        one row instead of rewriting the whole history.
+        """
         os.makedirs(os.path.dirname(out_path), exist_ok=True)
-        daily_df.to_csv(out_path, index=False)
+        last_day = PerformancePlotter._last_saved_day(out_path)
+        if last_day is None:
+            daily_df.to_csv(out_path, index=False, lineterminator="\n")
+        else:
+            new = daily_df[daily_df["day"].astype(str) > last_day]
+            if len(new):
+                new.to_csv(out_path, mode="a", header=False, index=False, lineterminator="\n")
         return out_path
 
     @staticmethod
-    def plot_equity(daily_df: pd.DataFrame, title="Equity Curve",
+    def _last_saved_day(path: str) -> str | None:
+        """ISO day of the file's last row, read by seeking the tail rather
+        than scanning the file; None for a missing, empty or header-only file."""
+        try:
+            with open(path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                size = f.tell()
+                if size == 0:
+                    return None
+                f.seek(max(0, size - 4096))
+                chunk = f.read()
+        except FileNotFoundError:
+            return None
+        lines = chunk.rstrip(b"\n").split(b"\n")
+        last = lines[-1].split(b",", 1)[0].decode()
+        if last == "day" or not last:
+            return None
+        return last
+
+    @classmethod
+    def _headless(cls):
+        if cls._fig is None:
+            # plain Figure + Agg canvas, no pyplot state machine involved
+            cls._fig = Figure(figsize=(10, 5))
+            FigureCanvasAgg(cls._fig)
+            cls._ax = cls._fig.add_subplot(111)
+            (cls._line,) = cls._ax.plot([], [])
+            cls._ax.set_xlabel("Date")
+            cls._ax.set_ylabel("Equity (Start = 1.0)")
+            cls._ax.grid(True)
+        return cls._fig, cls._ax, cls._line
+
+    @classmethod
+    def plot_equity(cls, daily_df: pd.DataFrame, title="Equity Curve",
                     save_path: str | None = None, show: bool = True):
+        # 'day' holds datetime.date objects; a straight datetime64 cast skips
+        # pd.to_datetime's format inference
+        x = daily_df["day"].values.astype("datetime64[ns]")
+        y = daily_df["equity_curve"].to_numpy()
+
+        if not show:
+            fig, ax, line = cls._headless()
+            # set_data bypasses the unit framework, so register the datetime
+            # axis explicitly or the ticks render as raw day ordinals
+            ax.xaxis.update_units(x)
+            line.set_data(x, y)
+            ax.set_title(title)
+            ax.relim()
+            ax.autoscale_view()
+            if save_path:
+                os.makedirs(os.path.dirname(save_path), exist_ok=True)
+                fig.savefig(save_path, dpi=150, bbox_inches="tight")
+            return
+
         plt.figure(figsize=(10, 5))
-        x = pd.to_datetime(daily_df["day"])
-        y = daily_df["equity_curve"]
         plt.plot(x, y)
         plt.title(title)
         plt.xlabel("Date")
@@ -26,7 +96,4 @@ class PerformancePlotter:
         if save_path:
             os.makedirs(os.path.dirname(save_path), exist_ok=True)
             plt.savefig(save_path, dpi=150)
-        if show:
-            plt.show()
-        else:
-            plt.close()
+        plt.show()
@@ -2,6 +2,63 @@ import numpy as np
 import pandas as pd
 
 from lib.BaseStrategy import BaseStrategy
+from lib._numba import njit, HAVE_NUMBA
+
+
+@njit(cache=True)
+def _sma_cross_kernel(px, fast, slow, long_only):
+    """
+    Fused crossover pass: both window sums advance with add-new/drop-old
+    updates and the comparison is cross-multiplied (sum_slow * fast vs
+    sum_fast * slow) so no division happens in the loop. Encoding matches
+    _encode: fast above slow -> -1, below -> +1, warmup -> 0; with
+    long_only the -1 leg is dropped at the source instead of remapped later.
+    """
+    n = px.shape[0]
+    raw = np.zeros(n, dtype=np.int8)
+    sum_fast = 0.0
+    sum_slow = 0.0
+    start = max(fast, slow) - 1
+    for i in range(n):
+        x = px[i]
+        sum_fast += x
+        sum_slow += x
+        if i >= fast:
+            sum_fast -= px[i - fast]
+        if i >= slow:
+            sum_slow -= px[i - slow]
+        if i >= start:
+            slow_scaled = sum_slow * fast
+            fast_scaled = sum_fast * slow
+            if slow_scaled > fast_scaled:
+                raw[i] = 1
+            elif slow_scaled < fast_scaled and not long_only:
+                raw[i] = -1
+    return raw
+
+
+def _cumsum1(x: np.ndarray) -> np.ndarray:
+    """Prefix sum with a leading zero, so window sums are cs[i+1] - cs[i+1-n]."""
+    cs = np.empty(x.size + 1, dtype=np.float64)
+    cs[0] = 0.0
+    np.cumsum(x, out=cs[1:])
+    return cs
+
+
+def _sma_from_cs(cs: np.ndarray, n: int) -> np.ndarray:
+    out = np.full(cs.size - 1, np.nan)
+    out[n - 1:] = (cs[n:] - cs[:-n]) * (1.0 / n)
+    return out
+
+
+def _sma_cumsum(x: np.ndarray, n: int) -> np.ndarray:
+    """
+    O(n) simple moving average via the prefix-sum identity
+    SMA[i] = (cs[i+1] - cs[i+1-n]) / n, with the first n-1 slots NaN to
+    mirror rolling(n, min_periods=n). Assumes a NaN-free input; a NaN
+    would poison the prefix sums from that point on.
+    """
+    return _sma_from_cs(_cumsum1(x), n)
 
 
 class SMACrossoverStrategy(BaseStrategy):
@@ -14,12 +71,56 @@ class SMACrossoverStrategy(BaseStrategy):
     def name():
         return "SMACrossover"
 
-    def generate_signals(self, df: pd.DataFrame) -> pd.DataFrame:
-        px = pd.to_numeric(df[self.price_col], errors="coerce")
-        sma_fast = px.rolling(self.fast, min_periods=self.fast).mean()
-        sma_slow = px.rolling(self.slow, min_periods=self.slow).mean()
+    def generate_signal_arrays(self, df: pd.DataFrame) -> tuple:
+        arr = self._cached_array(
+            df, ("px", self.price_col),
+            lambda: np.ascontiguousarray(self._to_np(df, self.price_col)))
+        if np.isnan(arr).any():
+            # dirty input: per-window NaN handling via the rolling helper
+            raw = self._encode(self._rolling_mean(arr, self.fast),
+                               self._rolling_mean(arr, self.slow))
+        elif HAVE_NUMBA:
+            raw = _sma_cross_kernel(arr, self.fast, self.slow, not self.allow_short)
+        else:
+            cs = self._cached_array(df, ("px_cumsum", self.price_col), lambda: _cumsum1(arr))
+            raw = self._encode(_sma_from_cs(cs, self.fast), _sma_from_cs(cs, self.slow))
+
+        return self.align_signal_arrays(df, raw, long_only_encoded=True)
+
+    def generate_signals_batch(self, df: pd.DataFrame, window_pairs) -> dict:
+        """
+        Sweep several (fast, slow) pairs in one pass: the price prefix sum is
+        computed once and each window's SMA is two slice subtractions off it,
+        shared between pairs. Returns {(fast, slow): signal frame}.
+        """
+        arr = self._cached_array(
+            df, ("px", self.price_col),
+            lambda: np.ascontiguousarray(self._to_np(df, self.price_col)))
+        if np.isnan(arr).any():
+            return {
+                (int(fast), int(slow)): SMACrossoverStrategy(
+                    fast=fast, slow=slow,
+                    allow_short=self.allow_short, price_col=self.price_col,
+                ).generate_signals(df)
+                for fast, slow in window_pairs
+            }
+        cs = self._cached_array(df, ("px_cumsum", self.price_col), lambda: _cumsum1(arr))
+        smas = {}
+        results = {}
+        for fast, slow in window_pairs:
+            fast, slow = int(fast), int(slow)
+            for n in (fast, slow):
+                if n not in smas:
+                    smas[n] = _sma_from_cs(cs, n)
+            results[(fast, slow)] = self.align_signal_ready_time(
+                df, self._encode(smas[fast], smas[slow]), long_only_encoded=True)
+        return results
 
-        raw = np.where(sma_fast > sma_slow, -1,
-                       np.where(sma_fast < sma_slow, 1, 0))
-        out = self.align_signal_ready_time(df, raw)
-        return out
+    def _encode(self, sma_fast: np.ndarray, sma_slow: np.ndarray) -> np.ndarray:
+        # contrarian crossover: fast above slow -> -1, below -> +1, NaN -> 0
+        if not self.allow_short:
+            # long-only collapses to one comparison: > is False for NaN and
+            # for the -1 leg alike, so no second remapping pass is needed
+            return (sma_slow > sma_fast).astype(np.int8)
+        diff = sma_slow - sma_fast
+        return (diff > 0).astype(np.int8) - (diff < 0).astype(np.int8)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 import datetime as dt
+import io
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Iterable, List, Optional, Tuple
 
@@ -93,36 +95,43 @@ def _daterange(start_date: dt.date, end_date: dt.date) -> List[str]:
     return pd.date_range(start=start_date, end=end_date, freq="D").strftime("%Y-%m-%d").tolist()
 
 
-def _head_exists(url: str) -> bool:
-    r = SESSION.head(url)
-    # Some endpoints may not support HEAD consistently; fall back to GET headers-only style
-    if r.status_code == 405:  # Method Not Allowed
-        r = SESSION.get(url, stream=True)
-        try:
-            r.close()
-        except Exception:
-            pass
-    return 200 <= r.status_code < 300
+# zips above this advertised size spill to disk instead of a BytesIO
+_MAX_IN_MEMORY_ZIP = 64 * 1024 * 1024
 
 
 # ------------------------------ Core I/O ------------------------------
-def _download_zip(url: str, out_path: Path) -> None:
+def _download_zip(url: str, out_path: Path):
+    """
+    One streaming GET per file: a missing date shows up as 404 on the same
+    request that would fetch it, so there is no separate HEAD probe round
+    trip. The daily zips are a few MB, so the body lands in a BytesIO and
+    never touches disk; anything advertising >64MB spills to out_path.
+    Returns an open seekable handle on the zip bytes, or None on 404.
+    """
     with SESSION.get(url, stream=True) as r:
+        if r.status_code == 404:
+            return None
         r.raise_for_status()
-        with open(out_path, "wb") as f:
-            for chunk in r.iter_content(chunk_size=1024 * 256):
-                if chunk:
-                    f.write(chunk)
-
-
-def _extract_zip(zip_path: Path, dest_folder: Path) -> None:
+        if int(r.headers.get("Content-Length") or 0) > _MAX_IN_MEMORY_ZIP:
+            with open(out_path, "wb") as f:
+                for chunk in r.iter_content(chunk_size=1024 * 256):
+                    if chunk:
+                        f.write(chunk)
+            return open(out_path, "rb")
+        buf = io.BytesIO()
+        for chunk in r.iter_content(chunk_size=1024 * 256):
+            if chunk:
+                buf.write(chunk)
+        buf.seek(0)
+        return buf
+
+
+def _extract_zip(zip_file, dest_folder: Path, zip_name: str) -> None:
     try:
-        with zipfile.ZipFile(zip_path, "r") as z:
+        with zipfile.ZipFile(zip_file, "r") as z:
             z.extractall(dest_folder)
     except zipfile.BadZipFile as e:
-        # Clean up corrupt file to allow re-download next run
-        zip_path.unlink(missing_ok=True)
-        raise RuntimeError(f"Corrupt ZIP: {zip_path}") from e
+        raise RuntimeError(f"Corrupt ZIP: {zip_name}") from e
 
 
 def download_and_extract_binance_data(
@@ -130,16 +139,22 @@ def download_and_extract_binance_data(
         zip_url: str,
         zip_path: Path,
         zip_filename: str,
-) -> None:
+) -> bool:
     print(f" ======= Downloading {zip_filename} =========")
     try:
-        _download_zip(zip_url, zip_path)
+        zip_file = _download_zip(zip_url, zip_path)
+        if zip_file is None:
+            print(f"Skip {zip_filename} (404 or unavailable).")
+            return False
         print(f"Downloaded {zip_filename}")
 
-        _extract_zip(zip_path, destination)
+        with zip_file:
+            _extract_zip(zip_file, destination, zip_filename)
         print(f"Extracted {zip_filename}")
+        return True
     finally:
-        # Always try to delete zip; if missing, ignore
+        # Remove the spill file if the download fell back to disk; a corrupt
+        # one would otherwise block the re-download on the next run
         zip_path.unlink(missing_ok=True)
 
 
@@ -156,14 +171,9 @@ def download_dates_for(
     _ensure_dir(destination_path)
     base = _base_url(symbol, kind)
 
-    for d in dates:
+    def _fetch(d: str) -> None:
         zip_name = _zip_filename(symbol, kind, d)
         url = base + zip_name
-        # Skip early if file doesn't exist upstream
-        if not _head_exists(url):
-            print(f"Skip {zip_name} (404 or unavailable).")
-            continue
-
         zip_path = destination_path / zip_name
         try:
             download_and_extract_binance_data(destination_path, url, zip_path, zip_name)
@@ -172,6 +182,13 @@ def download_dates_for(
         except Exception as e:
             print(f"Error for {zip_name}: {e}")
 
+    # each date is one small network-bound request: run them on a pool so the
+    # wall clock is ~one round trip instead of one per day. SESSION pools up
+    # to 20 connections and zlib releases the GIL during extraction, so both
+    # phases overlap across threads.
+    with ThreadPoolExecutor(max_workers=16) as ex:
+        list(ex.map(_fetch, dates))
+
 
 def process_futures_symbol(
         symbol: str,